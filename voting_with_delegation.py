@@ -1,12 +1,128 @@
 from __future__ import annotations
 
+import functools
+import os
+import struct
 import time
-from dataclasses import dataclass
-from typing import Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from eth_account import Account
-from eth_account.messages import encode_structured_data
-from eth_utils import to_checksum_address
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+try:
+    # Optional: libsecp256k1 bindings make public-key recovery much cheaper.
+    from coincurve import PublicKey
+except ImportError:  # pragma: no cover - fall back to eth_account
+    PublicKey = None
+
+EIP712_DOMAIN_TYPEHASH = keccak(
+    b"EIP712Domain(string name,string version,uint256 chainId,"
+    b"address verifyingContract)"
+)
+DELEGATION_TYPEHASH = keccak(
+    b"Delegation(address delegator,address delegatee,uint256 nonce,uint256 deadline)"
+)
+DOMAIN_NAME = "XterioVoting"
+DOMAIN_VERSION = "1"
+
+# ABI layouts of the two fixed EIP-712 structs: 32-byte words, addresses
+# left-padded with 12 zero bytes.
+_DOMAIN_STRUCT = struct.Struct(">32s32s32s32s12x20s")
+_DELEGATION_STRUCT = struct.Struct(">32s12x20s12x20s32s32s")
+
+# secp256k1 order / 2. A signature with a larger s is the malleable twin of a
+# low-s one; such signatures are rejected outright, not normalized to low-s,
+# matching Ethereum's rule since Homestead.
+_SECP256K1_HALF_N = 0x7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF5D576E7357A4501DDFE92F46681B20A0
+
+
+def _canon(address: str) -> str:
+    # Internal dict key: lowercase 0x-address. Validating it needs no keccak,
+    # unlike EIP-55, which is only applied to values handed back to callers.
+    # Like to_checksum_address, a missing 0x prefix is accepted.
+    s = address.lower()
+    if not s.startswith("0x"):
+        s = "0x" + s
+    digits = s[2:]
+    # isalnum() rules out the "_" and whitespace that int() would tolerate.
+    if len(digits) != 40 or not (digits.isascii() and digits.isalnum()):
+        raise ValueError(f"invalid address: {address!r}")
+    try:
+        int(digits, 16)
+    except ValueError:
+        raise ValueError(f"invalid address: {address!r}") from None
+    return s
+
+
+@functools.lru_cache(maxsize=8192)
+def _cs(address: str) -> str:
+    # EIP-55 checksumming costs a keccak256 per call; memoize it so repeated
+    # lookups of the same address become a dict hit.
+    return to_checksum_address(address)
+
+
+@functools.lru_cache(maxsize=4096)
+def _recover(digest: bytes, signature: bytes) -> str:
+    # Keyed on the full digest and 65-byte signature, so retried or repeated
+    # verifications of the same message skip the elliptic-curve work.
+
+    # Reject malformed or high-s signatures before any elliptic-curve work.
+    if len(signature) != 65:
+        raise ValueError("invalid signature length")
+    v = signature[64]
+    if v not in (0, 1, 27, 28):
+        raise ValueError("invalid signature v")
+    s = int.from_bytes(signature[32:64], "big")
+    if s == 0 or s > _SECP256K1_HALF_N:
+        raise ValueError("invalid signature s: not in low-s form")
+    if PublicKey is None:
+        return Account._recover_hash(digest, signature=signature).lower()
+    if v >= 27:
+        v -= 27
+    public_key = PublicKey.from_signature_and_message(
+        signature[:64] + bytes((v,)), digest, hasher=None
+    )
+    address = keccak(public_key.format(compressed=False)[1:])[-20:]
+    return "0x" + address.hex()
+
+
+def _make_encoder(domain_separator: bytes) -> Callable[[bytes, bytes, int, int], bytes]:
+    # Specialized for the Delegation schema: the layout, typehash and digest
+    # prefix are bound here, so each call is one pack and two keccaks.
+    prefix = b"\x19\x01" + domain_separator
+    pack = _DELEGATION_STRUCT.pack
+
+    def encode_delegation(
+        delegator: bytes, delegatee: bytes, nonce: int, deadline: int
+    ) -> bytes:
+        struct_hash = keccak(
+            pack(
+                DELEGATION_TYPEHASH,
+                delegator,
+                delegatee,
+                nonce.to_bytes(32, "big"),
+                deadline.to_bytes(32, "big"),
+            )
+        )
+        return keccak(prefix + struct_hash)
+
+    return encode_delegation
 
 
 @dataclass(frozen=True)
@@ -17,13 +133,42 @@ class DelegationMessage:
     deadline: int
 
 
+class Tallies(NamedTuple):
+    yes: int
+    no: int
+    abstain: int
+
+
+@dataclass(slots=True)
+class Proposal:
+    title: str
+    description: str
+    closes_at: int
+    # Row of this proposal in VotingWithDelegation's tally columns.
+    row: int
+    # Bitset over voter ids: bit (id & 7) of byte (id >> 3) is set once that
+    # holder has voted. Grown in place, so marking a vote never copies it.
+    voted: bytearray = field(default_factory=bytearray)
+
+
 class EIP712DelegationVerifier:
     def __init__(self, *, chain_id: int, verifying_contract: str):
         self.chain_id = chain_id
         self.verifying_contract = to_checksum_address(verifying_contract)
-
-    def build_typed_data(self, message: DelegationMessage) -> Dict:
-        return {
+        # The domain is fixed per verifier, so hash it once up front.
+        self._domain_separator = keccak(
+            _DOMAIN_STRUCT.pack(
+                EIP712_DOMAIN_TYPEHASH,
+                keccak(text=DOMAIN_NAME),
+                keccak(text=DOMAIN_VERSION),
+                chain_id.to_bytes(32, "big"),
+                bytes.fromhex(self.verifying_contract[2:]),
+            )
+        )
+        self._encode = _make_encoder(self._domain_separator)
+        # Constant part of build_typed_data(); "types" and "domain" are shared
+        # by reference between calls and must be treated as read-only.
+        self._typed_template = {
             "types": {
                 "EIP712Domain": [
                     {"name": "name", "type": "string"},
@@ -40,24 +185,56 @@ class EIP712DelegationVerifier:
             },
             "primaryType": "Delegation",
             "domain": {
-                "name": "XterioVoting",
-                "version": "1",
+                "name": DOMAIN_NAME,
+                "version": DOMAIN_VERSION,
                 "chainId": self.chain_id,
                 "verifyingContract": self.verifying_contract,
             },
+        }
+
+    def build_typed_data(self, message: DelegationMessage) -> Dict:
+        return {
+            **self._typed_template,
             "message": {
-                "delegator": to_checksum_address(message.delegator),
-                "delegatee": to_checksum_address(message.delegatee),
+                "delegator": _cs(message.delegator),
+                "delegatee": _cs(message.delegatee),
                 "nonce": int(message.nonce),
                 "deadline": int(message.deadline),
             },
         }
 
+    def hash_delegation(self, message: DelegationMessage) -> bytes:
+        """EIP-712 digest of `message`, equivalent to hashing build_typed_data()."""
+        return self._encode(
+            bytes.fromhex(_canon(message.delegator)[2:]),
+            bytes.fromhex(_canon(message.delegatee)[2:]),
+            int(message.nonce),
+            int(message.deadline),
+        )
+
     def recover_delegator(self, message: DelegationMessage, signature: str) -> str:
-        typed = self.build_typed_data(message)
-        encoded = encode_structured_data(primitive=typed)
-        recovered = Account.recover_message(encoded, signature=signature)
-        return to_checksum_address(recovered)
+        return _cs(self._recover_signer(message, signature))
+
+    def recover_delegators(
+        self, messages: Sequence[DelegationMessage], signatures: Sequence[str]
+    ) -> List[str]:
+        return [_cs(a) for a in self._recover_signers(messages, signatures)]
+
+    # Lowercase signer addresses, for comparison against internal keys.
+    def _recover_signer(self, message: DelegationMessage, signature: str) -> str:
+        return _recover(self.hash_delegation(message), bytes(HexBytes(signature)))
+
+    def _recover_signers(
+        self, messages: Sequence[DelegationMessage], signatures: Sequence[str]
+    ) -> List[str]:
+        digests = [self.hash_delegation(m) for m in messages]
+        sigs = [bytes(HexBytes(s)) for s in signatures]
+        # coincurve releases the GIL inside libsecp256k1, so recoveries overlap;
+        # the pure-Python eth_account fallback would gain nothing from threads.
+        if PublicKey is None or len(digests) < 2:
+            return list(map(_recover, digests, sigs))
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            return list(ex.map(_recover, digests, sigs))
 
 
 class VotingWithDelegation:
@@ -65,36 +242,61 @@ class VotingWithDelegation:
         self.verifier = EIP712DelegationVerifier(
             chain_id=chain_id, verifying_contract=verifying_contract
         )
+        # All address keys below are lowercase (see _canon); EIP-55 checksummed
+        # addresses are only produced for return values.
         self.voter_weight: Dict[str, int] = {}
         self.delegate_of: Dict[str, str] = {}
         self.nonce_of: Dict[str, int] = {}
-        self.proposals: Dict[str, Dict] = {}
+        # Dense ids for addresses, used as bit positions in Proposal.voted.
+        self._voter_id: Dict[str, int] = {}
+        self.proposals: Dict[str, Proposal] = {}
+        # Tallies are stored column-wise, one list per choice indexed by
+        # Proposal.row, so cross-proposal queries scan flat lists of ints.
+        self._tally_yes: List[int] = []
+        self._tally_no: List[int] = []
+        self._tally_abstain: List[int] = []
+        # Total weight per final holder, updated in place by add_voter and
+        # delegation changes so queries never walk delegation chains.
+        self._guru_weight: Dict[str, int] = {}
+        # Public power map (holders with non-zero weight); rebuilt lazily from
+        # _guru_weight after any change to it.
+        self._power_cache: Optional[Dict[str, int]] = None
+        self._power_view: Optional[Tuple[Dict[str, int], Mapping[str, int]]] = None
+        # Path-compressed view of delegate_of: address -> final delegate.
+        # Kept separate so delegate_of always holds the signed edges.
+        self._root_of: Dict[str, str] = {}
+        # Reverse index of delegate_of: direct delegators of an address.
+        self._delegators_of: Dict[str, Set[str]] = {}
 
     # ---------------------- Voters & Weights ----------------------
     def add_voter(self, address: str, weight: int) -> None:
-        addr = to_checksum_address(address)
+        addr = _canon(address)
         if weight < 0:
             raise ValueError("weight must be non-negative")
+        if addr not in self._voter_id:
+            self._voter_id[addr] = len(self._voter_id)
+        delta = weight - self.voter_weight.get(addr, 0)
         self.voter_weight[addr] = weight
+        if delta:
+            self._add_guru_weight(self._resolve_final_delegate(addr), delta)
         if addr not in self.nonce_of:
             self.nonce_of[addr] = 0
 
     def get_direct_weight(self, address: str) -> int:
-        return self.voter_weight.get(to_checksum_address(address), 0)
+        return self.voter_weight.get(_canon(address), 0)
 
     # ---------------------- Delegation (EIP-712) ----------------------
     def get_nonce(self, delegator: str) -> int:
-        return self.nonce_of.get(to_checksum_address(delegator), 0)
+        return self.nonce_of.get(_canon(delegator), 0)
 
     def build_delegation_message(
         self, *, delegator: str, delegatee: str, deadline: int
     ) -> DelegationMessage:
-        delegator_cs = to_checksum_address(delegator)
-        delegatee_cs = to_checksum_address(delegatee)
-        nonce = self.get_nonce(delegator_cs)
+        delegator_key = _canon(delegator)
+        nonce = self.nonce_of.get(delegator_key, 0)
         return DelegationMessage(
-            delegator=delegator_cs,
-            delegatee=delegatee_cs,
+            delegator=_cs(delegator_key),
+            delegatee=_cs(_canon(delegatee)),
             nonce=nonce,
             deadline=deadline,
         )
@@ -108,76 +310,187 @@ class VotingWithDelegation:
         nonce: int,
         deadline: int,
     ) -> None:
-        now = int(time.time())
-        if now > int(deadline):
+        if int(time.time()) > deadline:
             raise ValueError("delegation signature expired")
 
         msg = DelegationMessage(
-            delegator=to_checksum_address(delegator),
-            delegatee=to_checksum_address(delegatee),
+            delegator=_canon(delegator),
+            delegatee=_canon(delegatee),
             nonce=int(nonce),
-            deadline=int(deadline),
+            deadline=deadline,
         )
 
-        expected_nonce = self.get_nonce(msg.delegator)
+        expected_nonce = self.nonce_of.get(msg.delegator, 0)
         if msg.nonce != expected_nonce:
             raise ValueError("invalid nonce for delegator")
 
-        recovered = self.verifier.recover_delegator(msg, signature)
+        recovered = self.verifier._recover_signer(msg, signature)
         if recovered != msg.delegator:
             raise ValueError("invalid signature: signer is not delegator")
 
         self._set_delegate(msg.delegator, msg.delegatee)
         self.nonce_of[msg.delegator] = expected_nonce + 1
 
+    def apply_delegation_signatures(self, batch: Iterable[Mapping[str, Any]]) -> None:
+        """Apply several signed delegations, each given as the keyword arguments
+        of apply_delegation_signature().
+
+        The batch is all-or-nothing: deadlines, nonces, cycles and signatures
+        are checked for every entry, in order, before any state changes. A
+        delegator may appear several times with consecutive nonces.
+        """
+        now = int(time.time())
+        messages: List[DelegationMessage] = []
+        signatures: List[str] = []
+        for item in batch:
+            deadline = int(item["deadline"])
+            if now > deadline:
+                raise ValueError("delegation signature expired")
+            messages.append(
+                DelegationMessage(
+                    delegator=_canon(item["delegator"]),
+                    delegatee=_canon(item["delegatee"]),
+                    nonce=int(item["nonce"]),
+                    deadline=deadline,
+                )
+            )
+            signatures.append(item["signature"])
+
+        # Replay the batch against scratch nonces and edges (None cancels a
+        # delegation) so that nonce and cycle failures leave state untouched.
+        next_nonce: Dict[str, int] = {}
+        edges: Dict[str, Optional[str]] = {}
+        for msg in messages:
+            expected_nonce = next_nonce.get(msg.delegator)
+            if expected_nonce is None:
+                expected_nonce = self.nonce_of.get(msg.delegator, 0)
+            if msg.nonce != expected_nonce:
+                raise ValueError("invalid nonce for delegator")
+            next_nonce[msg.delegator] = expected_nonce + 1
+            if msg.delegator == msg.delegatee:
+                edges[msg.delegator] = None
+                continue
+            current: Optional[str] = msg.delegatee
+            while current is not None:
+                if current == msg.delegator:
+                    raise ValueError("delegation would create a cycle")
+                if current in edges:
+                    current = edges[current]
+                else:
+                    current = self.delegate_of.get(current)
+            edges[msg.delegator] = msg.delegatee
+
+        recovered = self.verifier._recover_signers(messages, signatures)
+        for msg, signer in zip(messages, recovered):
+            if signer != msg.delegator:
+                raise ValueError("invalid signature: signer is not delegator")
+
+        for msg in messages:
+            self._set_delegate(msg.delegator, msg.delegatee)
+        self.nonce_of.update(next_nonce)
+
+    # Internal helpers below expect addresses already canonicalized by the caller.
     def _set_delegate(self, delegator: str, delegatee: str) -> None:
-        delegator_cs = to_checksum_address(delegator)
-        delegatee_cs = to_checksum_address(delegatee)
-        if delegator_cs == delegatee_cs:
+        if delegator == delegatee:
             # Self-delegation cancels any existing delegation chain
-            self.delegate_of.pop(delegator_cs, None)
+            if delegator in self.delegate_of:
+                old_root = self._resolve_final_delegate(delegator)
+                cancelled = self.delegate_of.pop(delegator)
+                self._delegators_of[cancelled].discard(delegator)
+                self._reroot(delegator, old_root, delegator)
             return
         # Detect cycles
-        if self._would_create_cycle(delegator_cs, delegatee_cs):
+        if self._would_create_cycle(delegator, delegatee):
             raise ValueError("delegation would create a cycle")
-        self.delegate_of[delegator_cs] = delegatee_cs
+        old_root = self._resolve_final_delegate(delegator)
+        previous = self.delegate_of.get(delegator)
+        if previous is not None:
+            self._delegators_of[previous].discard(delegator)
+        self.delegate_of[delegator] = delegatee
+        self._delegators_of.setdefault(delegatee, set()).add(delegator)
+        self._reroot(delegator, old_root, self._resolve_final_delegate(delegatee))
+
+    def _reroot(self, top: str, old_root: str, new_root: str) -> None:
+        # Move `top` and everyone delegating through it from old_root to new_root.
+        if old_root == new_root:
+            return
+        weights = self.voter_weight
+        moved = 0
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            if node == new_root:
+                self._root_of.pop(node, None)
+            else:
+                self._root_of[node] = new_root
+            moved += weights.get(node, 0)
+            stack.extend(self._delegators_of.get(node, ()))
+        if moved:
+            self._add_guru_weight(old_root, -moved)
+            self._add_guru_weight(new_root, moved)
+
+    def _add_guru_weight(self, holder: str, delta: int) -> None:
+        total = self._guru_weight.get(holder, 0) + delta
+        if total:
+            self._guru_weight[holder] = total
+        else:
+            del self._guru_weight[holder]
+        self._power_cache = None
 
     def _would_create_cycle(self, start: str, next_hop: str) -> bool:
-        seen: Set[str] = set()
-        current = to_checksum_address(next_hop)
-        start_cs = to_checksum_address(start)
-        while current in self.delegate_of:
-            if current in seen:
+        # delegate_of is a forest, so next_hop's chain can only reach start if
+        # both share a final delegate; that check is a compressed-root lookup.
+        root = self._resolve_final_delegate(next_hop)
+        if root != self._resolve_final_delegate(start):
+            return False
+        if root == start:
+            return True
+        # Same tree: a cycle only if start lies on next_hop's chain.
+        current = next_hop
+        while current != root:
+            if current == start:
                 return True
-            seen.add(current)
             current = self.delegate_of[current]
-            if current == start_cs:
-                return True
         return False
 
     def _resolve_final_delegate(self, addr: str) -> str:
-        addr_cs = to_checksum_address(addr)
-        current = addr_cs
-        seen: Set[str] = set()
+        root = self._root_of.get(addr)
+        if root is not None:
+            return root
+        current = addr
+        walked: List[str] = []
         while current in self.delegate_of:
-            if current in seen:
-                break
-            seen.add(current)
+            walked.append(current)
             current = self.delegate_of[current]
+            root = self._root_of.get(current)
+            if root is not None:
+                current = root
+                break
+        # Compress: every node on the walked path shares the same root.
+        for node in walked:
+            self._root_of[node] = current
         return current
 
-    def get_effective_voting_power_map(self) -> Dict[str, int]:
-        power: Dict[str, int] = {}
-        for voter, weight in self.voter_weight.items():
-            if weight == 0:
-                continue
-            final_holder = self._resolve_final_delegate(voter)
-            power[final_holder] = power.get(final_holder, 0) + weight
+    def _power_map(self) -> Dict[str, int]:
+        power = self._power_cache
+        if power is None:
+            power = {g: w for g, w in self._guru_weight.items() if w > 0}
+            self._power_cache = power
         return power
 
+    def get_effective_voting_power_map(self) -> Mapping[str, int]:
+        # Read-only, checksummed view of the cache; rebuilt only when the
+        # underlying power map has been rebuilt.
+        power = self._power_map()
+        view = self._power_view
+        if view is None or view[0] is not power:
+            checksummed = {_cs(holder): weight for holder, weight in power.items()}
+            view = self._power_view = (power, MappingProxyType(checksummed))
+        return view[1]
+
     def get_effective_voting_power(self, address: str) -> int:
-        final_holder = self._resolve_final_delegate(address)
-        return self.get_effective_voting_power_map().get(final_holder, 0)
+        final_holder = self._resolve_final_delegate(_canon(address))
+        return self._guru_weight.get(final_holder, 0)
 
     # ---------------------- Proposals & Voting ----------------------
     def create_proposal(
@@ -185,57 +498,96 @@ class VotingWithDelegation:
     ) -> None:
         if proposal_id in self.proposals:
             raise ValueError("proposal already exists")
-        if int(closes_at) <= int(time.time()):
+        closes_at = int(closes_at)
+        if closes_at <= int(time.time()):
             raise ValueError("closes_at must be in the future")
-        self.proposals[proposal_id] = {
-            "title": title,
-            "description": description,
-            "closes_at": int(closes_at),
-            "tallies": {"yes": 0, "no": 0, "abstain": 0},
-            "voted": set(),
-        }
+        row = len(self._tally_yes)
+        self._tally_yes.append(0)
+        self._tally_no.append(0)
+        self._tally_abstain.append(0)
+        self.proposals[proposal_id] = Proposal(
+            title=title, description=description, closes_at=closes_at, row=row
+        )
 
-    def vote(self, *, proposal_id: str, voter: str, choice: str) -> Tuple[int, Dict[str, int]]:
-        if proposal_id not in self.proposals:
+    def vote(
+        self, *, proposal_id: str, voter: str, choice: str
+    ) -> Tuple[int, Tallies]:
+        now = int(time.time())
+        prop = self.proposals.get(proposal_id)
+        if prop is None:
             raise ValueError("unknown proposal")
         if choice not in ("yes", "no", "abstain"):
             raise ValueError("invalid choice")
-        prop = self.proposals[proposal_id]
-        if int(time.time()) > int(prop["closes_at"]):
+        if now > prop.closes_at:
             raise ValueError("voting closed")
 
-        voter_cs = to_checksum_address(voter)
-        final_holder = self._resolve_final_delegate(voter_cs)
+        voter_key = _canon(voter)
+        final_holder = self._resolve_final_delegate(voter_key)
 
-        if voter_cs != final_holder:
+        if voter_key != final_holder:
             raise ValueError("delegated voters cannot cast a direct vote")
 
-        if final_holder in prop["voted"]:
-            raise ValueError("already voted for this proposal")
+        voted = prop.voted
+        voter_id = self._voter_id.get(final_holder)
+        if voter_id is not None:
+            byte = voter_id >> 3
+            if byte < len(voted) and voted[byte] & (1 << (voter_id & 7)):
+                raise ValueError("already voted for this proposal")
 
-        power_map = self.get_effective_voting_power_map()
-        weight = power_map.get(final_holder, 0)
+        weight = self._guru_weight.get(final_holder, 0)
         if weight <= 0:
             raise ValueError("no voting power")
 
-        prop["tallies"][choice] += int(weight)
-        prop["voted"].add(final_holder)
-        return weight, dict(prop["tallies"])  # return snapshot
+        # Delegatees need not be registered voters, so a holder that actually
+        # votes gets an id here if add_voter never assigned one.
+        if voter_id is None:
+            voter_id = self._voter_id[final_holder] = len(self._voter_id)
+        byte = voter_id >> 3
+        if byte >= len(voted):
+            voted.extend(bytes(byte + 1 - len(voted)))
+
+        row = prop.row
+        if choice == "yes":
+            self._tally_yes[row] += weight
+        elif choice == "no":
+            self._tally_no[row] += weight
+        else:
+            self._tally_abstain[row] += weight
+        voted[byte] |= 1 << (voter_id & 7)
+        return weight, self._tallies(row)  # return snapshot
+
+    def _tallies(self, row: int) -> Tallies:
+        return Tallies(
+            self._tally_yes[row], self._tally_no[row], self._tally_abstain[row]
+        )
 
-    def get_results(self, proposal_id: str) -> Dict[str, int]:
-        if proposal_id not in self.proposals:
+    def get_results(self, proposal_id: str) -> Tallies:
+        prop = self.proposals.get(proposal_id)
+        if prop is None:
             raise ValueError("unknown proposal")
-        return dict(self.proposals[proposal_id]["tallies"])
+        return self._tallies(prop.row)
+
+    def get_all_results(self) -> Dict[str, Tallies]:
+        # Proposals are never removed, so insertion order matches row order.
+        return dict(
+            zip(
+                self.proposals,
+                map(Tallies, self._tally_yes, self._tally_no, self._tally_abstain),
+            )
+        )
 
     def is_open(self, proposal_id: str) -> bool:
-        if proposal_id not in self.proposals:
+        prop = self.proposals.get(proposal_id)
+        if prop is None:
             raise ValueError("unknown proposal")
-        return int(time.time()) <= int(self.proposals[proposal_id]["closes_at"])
+        return int(time.time()) <= prop.closes_at
 
 
 __all__ = [
     "DelegationMessage",
     "EIP712DelegationVerifier",
+    "Proposal",
+    "Tallies",
     "VotingWithDelegation",
 ]
 